@@ -1,6 +1,8 @@
 # app.py
 import asyncio
+import atexit
 import json
+import threading
 import streamlit as st
 from dotenv import load_dotenv
 from client import FlightOpsMCPClient
@@ -12,22 +14,54 @@ st.set_page_config(page_title="FlightOps Smart Agent (Groq MCP)", layout="wide")
 st.title("✈️ FlightOps — Groq + MCP Chatbot")
 st.caption("Ask any flight operations question. The LLM plans tool calls → MCP server executes → Groq summarizes.")
 
-# Create global event loop if not exists
-if "event_loop" not in st.session_state:
-    st.session_state.event_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(st.session_state.event_loop)
+@st.cache_resource
+def get_event_loop():
+    """
+    One event loop per Streamlit process, running forever in a background thread
+    so it survives reruns and keeps background tasks (e.g. summaries) progressing.
+    Shared by all browser sessions so threads and sockets don't pile up per session.
+    """
+    # uvloop is a faster drop-in event loop where available (Linux/macOS);
+    # create it directly so the Streamlit process's global loop policy is untouched
+    try:
+        import uvloop
+        event_loop = uvloop.new_event_loop()
+    except ImportError:
+        event_loop = asyncio.new_event_loop()
+    threading.Thread(target=event_loop.run_forever, daemon=True).start()
+    return event_loop
+
+loop = get_event_loop()
 
-loop = st.session_state.event_loop
+def run_async(coro):
+    """Run a coroutine on the background event loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
 
-# Initialize MCP client once per session
-if "mcp_client" not in st.session_state:
-    st.session_state.mcp_client = FlightOpsMCPClient()
-mcp_client = st.session_state.mcp_client
+async def _wait_for(task):
+    """Await a task created on the background loop."""
+    return await task
+
+def _shutdown(client: FlightOpsMCPClient, event_loop):
+    """Close the shared client (MCP transport and Groq pool), then stop the background loop."""
+    try:
+        asyncio.run_coroutine_threadsafe(client.close(), event_loop).result(timeout=5)
+    except Exception:
+        pass
+    event_loop.call_soon_threadsafe(event_loop.stop)
 
-# Connect once per app session
+@st.cache_resource
+def get_mcp_client():
+    """One MCP client (transport and Groq pool) per process, shared by all sessions."""
+    client = FlightOpsMCPClient()
+    atexit.register(_shutdown, client, get_event_loop())
+    return client
+
+mcp_client = get_mcp_client()
+
+# Connect once per app session (no-op if the shared client is already connected)
 if "mcp_connected" not in st.session_state:
     try:
-        loop.run_until_complete(mcp_client.connect())
+        run_async(mcp_client.connect())
         st.session_state.mcp_connected = True
         st.success("✅ Connected to MCP server")
     except Exception as e:
@@ -55,8 +89,8 @@ if st.button("Ask"):
     st.info("🧠 Thinking with Groq LLM to plan the query...")
     with st.spinner("Generating tool plan and fetching results..."):
         try:
-            # ✅ Use the same event loop, don't recreate
-            result = loop.run_until_complete(mcp_client.run_query(user_query))
+            # ✅ Use the same background event loop, don't recreate
+            result = run_async(mcp_client.run_query(user_query, defer_summary=True))
         except Exception as e:
             st.error(f"❌ Error during query:\n{e}")
             st.stop()
@@ -79,6 +113,12 @@ if st.button("Ask"):
             st.markdown(f"**Tool:** `{tool_name}`")
             st.json(tool_result)
 
+    # Summary has been generating in the background while results rendered
+    summary_task = result.pop("summary_task", None)
+    if summary_task is not None:
+        with st.spinner("Summarizing results with Groq..."):
+            result["summary"] = run_async(_wait_for(summary_task))
+
     summary = result.get("summary", {}).get("summary", "")
     if summary:
         st.subheader("📝 Final Summary")
@@ -91,4 +131,4 @@ if st.button("Ask"):
 # Show previous result
 if "last_result" in st.session_state:
     with st.expander("📦 Previous Results"):
-        st.json(st.session_state.last_result)
+        st.json(st.session_state.last_result)
\ No newline at end of file
@@ -1,15 +1,22 @@
 import os
+import re
 import json
 import logging
 import asyncio
-from typing import List, Dict, Any
+import copy
+import time
+from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
-from groq import Groq
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+from groq import AsyncGroq
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
-from tool_registry import TOOLS
+from tool_registry import TOOLS, ARG_SCHEMAS, REQUIRED_ARGS
 
 # Load environment variables
 load_dotenv()
@@ -24,79 +31,172 @@ if not GROQ_API_KEY:
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger("FlightOps.MCPClient")
 
-# Initialize Groq LLM client
-client_groq = Groq(api_key=GROQ_API_KEY)
+# Tools whose output must never be served from the result cache
+UNCACHED_TOOLS = {"health_check", "raw_mongodb_query"}
 
-def _build_tool_prompt() -> str:
-    """Convert TOOLS dict into compact text to feed the LLM."""
-    lines = []
-    for name, meta in TOOLS.items():
-        arg_str = ", ".join(meta["args"])
-        lines.append(f"- {name}({arg_str}): {meta['desc']}")
-    return "\n".join(lines)
+# Single-flight lookups that the server can answer together via one bundle call
+BUNDLE_TOOL = "get_flight_bundle"
+FLIGHT_ARGS = ("carrier", "flight_number", "date_of_origin")
+FLIGHT_TOOLS = {name for name, meta in TOOLS.items() if tuple(meta["args"]) == FLIGHT_ARGS}
 
-SYSTEM_PROMPT_PLAN = f"""
-You are an assistant that converts user questions into MCP tool calls.
-Use only these tools exactly as defined below:
+# Deterministic query shapes planned without an LLM round-trip:
+# a flight code like 6E215, an ISO date, and one or more topic phrases.
+# Once those and a few filler words are removed nothing may be left,
+# otherwise the query asks for something unmatched and goes to the LLM planner.
+_FAST_FLIGHT_RE = re.compile(r"\b([A-Z]{2}|[A-Z]\d|\d[A-Z])\s?(\d{1,4})\b")
+_FAST_DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_FAST_PATTERNS = [
+    (re.compile(r"\b(basic info|details?|status|route|stations?)\b", re.I), "get_flight_basic_info"),
+    (re.compile(r"\b(delay(s|ed)?|late)\b", re.I), "get_delay_summary"),
+    (re.compile(r"\b(aircraft|equipment|tail( number)?|registration)\b", re.I), "get_equipment_info"),
+    (
+        re.compile(
+            r"\b(operation times?|take-?offs?|land(s|ed|ing)?|depart(s|ed|ure)?|arriv(e|es|ed|al)|"
+            r"block times?|taxi(-?(out|in))?|schedule(d)?)\b",
+            re.I,
+        ),
+        "get_operation_times",
+    ),
+    (re.compile(r"\bfuel\b", re.I), "get_fuel_summary"),
+]
+_FAST_STOPWORDS = {
+    "a", "about", "an", "and", "are", "at", "did", "do", "does", "flight", "for",
+    "get", "give", "how", "info", "information", "is", "its", "me", "of", "on",
+    "please", "show", "tell", "the", "time", "times", "was", "were", "what",
+    "when", "why", "with",
+}
 
-{_build_tool_prompt()}
+def _loads(text: str) -> Any:
+    """Parse JSON text, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
+def _build_tool_schemas(tools: dict = None) -> list:
+    """Convert TOOLS dict into Groq/OpenAI function-calling tool schemas."""
+    schemas = []
+    for name, meta in (tools or TOOLS).items():
+        parameters = meta.get("parameters") or {
+            "type": "object",
+            "properties": {arg: ARG_SCHEMAS.get(arg, {"type": "string"}) for arg in meta["args"]},
+            "required": [arg for arg in meta["args"] if arg in REQUIRED_ARGS],
+        }
+        schemas.append({
+            "type": "function",
+            "function": {"name": name, "description": meta["desc"], "parameters": parameters},
+        })
+    return schemas
+
+# Tool schemas travel in the request's `tools` field, so the prompt only carries rules.
+# Keep it byte-identical across calls so provider-side prefix caching can hit.
+SYSTEM_PROMPT_PLAN = """Answer flight-operations questions by calling the provided tools.
 Rules:
-1. Output only valid JSON.
-2. Always return a top-level key 'plan' as a list.
-3. If user asks something general like 'details of flight', use get_flight_basic_info.
-4. Do not invent tool names.
-5. If carrier or date not mentioned, omit them instead of writing 'unknown'.
-6. only use "tool" as key not "name"
+- Call every tool the question needs; calls run in parallel.
+- General flight details -> get_flight_basic_info.
+- Write date_of_origin as YYYY-MM-DD.
+- Omit unknown carrier/date instead of writing 'unknown'.
 """
 
+PLAN_TOOL_SCHEMAS = _build_tool_schemas()
+
 SYSTEM_PROMPT_SUMMARIZE = """
 You are an assistant that summarizes tool outputs into a concise answer.
 Focus on clarity and readability.
 """
 
 class FlightOpsMCPClient:
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, use_tool_cache: bool = True):
         self.base_url = (base_url or MCP_SERVER_URL).rstrip("/")
         self.session: ClientSession = None
         self._client_context = None
+        # Groq client is created lazily on the loop that uses it, see _get_groq()
+        self._groq: Optional[AsyncGroq] = None
+        # Serializes connect() so concurrent callers/Streamlit reruns share one session
+        self._connect_lock = asyncio.Lock()
+        # Cache for deterministic tool reads: key -> (timestamp, response)
+        self.use_tool_cache = use_tool_cache
+        self._tool_cache: Dict[str, tuple] = {}
+        self._cache_ttl = int(os.getenv("TOOL_CACHE_TTL", "300"))
+        self._cache_max = int(os.getenv("TOOL_CACHE_MAX", "1024"))
+        # Cached list_tools response: (timestamp, response)
+        self._tools_cache: Optional[tuple] = None
+        self._tools_ttl = int(os.getenv("TOOLS_LIST_TTL", "60"))
+        self.plan_tool_schemas = PLAN_TOOL_SCHEMAS
+        # Tools that get_flight_bundle can serve; refreshed from the live tool list
+        self.flight_tools = set(FLIGHT_TOOLS)
+        # Bound tool fan-out so a large plan doesn't flood the MCP/Mongo server
+        self._tool_semaphore = asyncio.Semaphore(int(os.getenv("TOOL_CONCURRENCY", "8")))
 
     async def connect(self):
-        """Connect to the MCP server using streamable-http transport."""
-        try:
-            logger.info(f"Connecting to MCP server at {self.base_url}")
-            
-            # streamablehttp_client returns a context manager
-            self._client_context = streamablehttp_client(self.base_url)
-            read_stream, write_stream, _ = await self._client_context.__aenter__()
+        """Connect to the MCP server using streamable-http transport (no-op if connected)."""
+        async with self._connect_lock:
+            if self.session is not None:
+                return
             
-            # Create session
-            self.session = ClientSession(read_stream, write_stream)
-            await self.session.__aenter__()
-            
-            # Initialize the connection
-            await self.session.initialize()
-            logger.info("✅ Connected to MCP server successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to MCP server: {e}")
-            raise
+            session = None
+            try:
+                logger.info(f"Connecting to MCP server at {self.base_url}")
+                
+                # streamablehttp_client returns a context manager
+                self._client_context = streamablehttp_client(self.base_url)
+                read_stream, write_stream, _ = await self._client_context.__aenter__()
+                
+                # Create session
+                session = ClientSession(read_stream, write_stream)
+                await session.__aenter__()
+                
+                # Initialize the connection; only publish the session once it is usable
+                await session.initialize()
+                self.session = session
+                logger.info("✅ Connected to MCP server successfully")
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to MCP server: {e}")
+                # Release the half-open session/transport before re-raising;
+                # the broken session is never published on self.session
+                client_context, self._client_context = self._client_context, None
+                await self._close_transport(session, client_context)
+                raise
 
     async def disconnect(self):
-        """Disconnect from the MCP server."""
-        try:
-            if self.session:
-                await self.session.__aexit__(None, None, None)
-            if self._client_context:
-                await self._client_context.__aexit__(None, None, None)
-            logger.info("Disconnected from MCP server")
-        except Exception as e:
-            logger.error(f"Error during disconnect: {e}")
+        """Disconnect from the MCP server. The Groq client stays open, see close()."""
+        # Detach state before awaiting so concurrent calls never see a closing session
+        self._tools_cache = None
+        session, self.session = self.session, None
+        client_context, self._client_context = self._client_context, None
+        await self._close_transport(session, client_context)
+        logger.info("Disconnected from MCP server")
+
+    async def close(self):
+        """Shut down the client: disconnect from MCP and close the Groq client."""
+        await self.disconnect()
+        groq_client, self._groq = self._groq, None
+        if groq_client is not None:
+            try:
+                await groq_client.close()
+            except Exception as e:
+                logger.error(f"Error closing Groq client: {e}")
+
+    @staticmethod
+    async def _close_transport(session, client_context):
+        """Exit the MCP session and transport independently so one failure can't leak the other."""
+        if session:
+            try:
+                await session.__aexit__(None, None, None)
+            except Exception as e:
+                logger.error(f"Error closing MCP session: {e}")
+        if client_context:
+            try:
+                await client_context.__aexit__(None, None, None)
+            except Exception as e:
+                logger.error(f"Error closing MCP transport: {e}")
 
     # ---------- MCP Server Interaction ----------
 
     async def list_tools(self) -> dict:
-        """List available tools from the MCP server."""
+        """List available tools from the MCP server (cached for a short TTL)."""
+        if self._tools_cache and time.monotonic() - self._tools_cache[0] < self._tools_ttl:
+            return self._tools_cache[1]
         try:
             if not self.session:
                 await self.connect()
@@ -111,12 +211,70 @@ class FlightOpsMCPClient:
                     "inputSchema": tool.inputSchema
                 }
             
-            return {"tools": tools_dict}
+            response = {"tools": tools_dict}
+            self._tools_cache = (time.monotonic(), response)
+            return response
         except Exception as e:
+            self._tools_cache = None
             logger.error(f"Error listing tools: {e}")
             return {"error": str(e)}
 
-    async def invoke_tool(self, tool_name: str, args: dict) -> dict:     
+    async def refresh_prompt(self) -> list:
+        """Rebuild the planner's tool schemas from the live MCP tool list."""
+        listing = await self.list_tools()
+        if "error" in listing:
+            logger.warning("Keeping static planner tool schemas; could not list tools.")
+            return self.plan_tool_schemas
+
+        tools = {}
+        flight_tools = set()
+        for name, meta in listing["tools"].items():
+            if name == BUNDLE_TOOL:
+                continue
+            properties = (meta.get("inputSchema") or {}).get("properties", {})
+            if set(properties) == set(FLIGHT_ARGS):
+                flight_tools.add(name)
+            desc = (meta.get("description") or "").strip().split("\n")[0]
+            tools[name] = {
+                "desc": desc or TOOLS.get(name, {}).get("desc", ""),
+                "parameters": meta.get("inputSchema") or {"type": "object", "properties": {}},
+            }
+        self.plan_tool_schemas = _build_tool_schemas(tools)
+        # Only bundle when the server actually offers the bundle tool
+        self.flight_tools = flight_tools if BUNDLE_TOOL in listing["tools"] else set()
+        return self.plan_tool_schemas
+
+    def clear_cache(self):
+        """Drop all cached tool results."""
+        self._tool_cache.clear()
+
+    def _cache_key(self, tool_name: str, args: dict) -> str:
+        """Build a stable cache key from server, tool name and arguments."""
+        return f"{self.base_url}|{tool_name}|{json.dumps(args, sort_keys=True, default=str)}"
+
+    async def invoke_tool(self, tool_name: str, args: dict) -> dict:
+        """Invoke a tool, serving repeat reads from the in-process TTL cache."""
+        cacheable = self.use_tool_cache and tool_name not in UNCACHED_TOOLS
+        if cacheable:
+            key = self._cache_key(tool_name, args)
+            cached = self._tool_cache.get(key)
+            if cached:
+                if time.monotonic() - cached[0] < self._cache_ttl:
+                    logger.info(f"Cache hit for tool: {tool_name}")
+                    return copy.deepcopy(cached[1])
+                # Expired: drop it so stale entries don't accumulate
+                self._tool_cache.pop(key, None)
+
+        resp = await self._call_tool(tool_name, args)
+
+        # Only cache successful responses
+        if cacheable and isinstance(resp, dict) and "error" not in resp and resp.get("ok", True):
+            if len(self._tool_cache) >= self._cache_max:
+                self._tool_cache.pop(next(iter(self._tool_cache)))
+            self._tool_cache[key] = (time.monotonic(), copy.deepcopy(resp))
+        return resp
+
+    async def _call_tool(self, tool_name: str, args: dict) -> dict:
         """Invoke a tool by name with arguments via MCP protocol."""
         try:
             if not self.session:
@@ -135,8 +293,8 @@ class FlightOpsMCPClient:
                     if hasattr(item, 'text'):
                         try:
                             # Try to parse as JSON
-                            content_items.append(json.loads(item.text))
-                        except json.JSONDecodeError:
+                            content_items.append(_loads(item.text))
+                        except ValueError:
                             content_items.append(item.text)
                 
                 # If single item, return it directly
@@ -150,40 +308,127 @@ class FlightOpsMCPClient:
             logger.error(f"Error invoking tool {tool_name}: {e}")
             return {"error": str(e)}
 
+    async def _invoke_bounded(self, tool_name: str, args: dict) -> dict:
+        """Invoke a tool while holding the fan-out semaphore."""
+        async with self._tool_semaphore:
+            return await self.invoke_tool(tool_name, args)
+
+    def _group_flight_steps(self, steps: list) -> list:
+        """
+        Turn plan steps into MCP calls. Lookups for the same flight are merged
+        into one get_flight_bundle call; each call records the step indices it serves.
+        """
+        calls = []
+        groups = {}
+        for idx, (tool, args) in enumerate(steps):
+            if tool in self.flight_tools and set(args) <= set(FLIGHT_ARGS):
+                key = tuple(str(args.get(k, "")).strip() for k in FLIGHT_ARGS)
+                if key in groups:
+                    calls[groups[key]][2].append(idx)
+                    continue
+                groups[key] = len(calls)
+            calls.append((tool, args, [idx]))
+
+        merged = []
+        for tool, args, members in calls:
+            if len(members) > 1:
+                tools = list(dict.fromkeys(steps[i][0] for i in members))
+                merged.append((BUNDLE_TOOL, {**args, "tools": tools}, members))
+            else:
+                merged.append((tool, args, members))
+        return merged
+
+    @staticmethod
+    def _split_bundle(resp: Any, tool: str) -> Any:
+        """Extract one tool's response from a get_flight_bundle response."""
+        if isinstance(resp, dict) and resp.get("ok") and tool in resp.get("data", {}):
+            return {"ok": True, "data": resp["data"][tool]}
+        return resp
+
+    @staticmethod
+    def _fast_plan(user_query: str) -> Optional[list]:
+        """
+        Build a plan directly for simple single-flight questions.
+        Returns None unless every word of the query is accounted for by the
+        flight code, the date, a topic phrase or a filler word.
+        """
+        dates = _FAST_DATE_RE.findall(user_query)
+        rest = _FAST_DATE_RE.sub(" ", user_query)
+        flights = _FAST_FLIGHT_RE.findall(rest)
+        if len(set(flights)) != 1 or len(set(dates)) != 1:
+            return None
+        rest = _FAST_FLIGHT_RE.sub(" ", rest)
+
+        tools = []
+        for pattern, tool in _FAST_PATTERNS:
+            if pattern.search(rest):
+                tools.append(tool)
+                rest = pattern.sub(" ", rest)
+
+        leftover = [word for word in re.findall(r"[a-z0-9]+", rest.lower()) if word not in _FAST_STOPWORDS]
+        if not tools or leftover:
+            return None
+
+        carrier, flight_number = flights[0]
+        args = {"carrier": carrier, "flight_number": flight_number, "date_of_origin": dates[0]}
+        return [{"tool": tool, "arguments": dict(args)} for tool in tools]
+
     # ---------- LLM Wrappers ----------
 
-    def _call_groq(self, messages: list, temperature: float = 0.2, max_tokens: int = 2048) -> str:
+    def _get_groq(self) -> AsyncGroq:
+        """Return the pooled AsyncGroq client, creating it on first use."""
+        if self._groq is None:
+            self._groq = AsyncGroq(api_key=GROQ_API_KEY)
+        return self._groq
+
+    async def _create_completion(self, messages: list, temperature: float, max_tokens: int, **kwargs):
+        """Run a Groq chat completion on the shared async client."""
+        return await self._get_groq().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+    async def _call_groq(self, messages: list, temperature: float = 0.2, max_tokens: int = 2048) -> str:
         """Internal helper for LLM chat completions."""
         try:
-            completion = client_groq.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            completion = await self._create_completion(messages, temperature, max_tokens)
             return completion.choices[0].message.content
         except Exception as e:
             logger.error(f"Groq API error: {e}")
             return json.dumps({"error": str(e)})
 
-    def plan_tools(self, user_query: str) -> dict:
-        """Use LLM to generate a plan of tool calls."""
+    async def plan_tools(self, user_query: str) -> dict:
+        """Use LLM function calling to generate a plan of tool calls."""
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT_PLAN},
             {"role": "user", "content": user_query},
         ]
-        content = self._call_groq(messages, temperature=0.1)
         try:
-            plan = json.loads(content)
-            if isinstance(plan, dict) and "plan" in plan:
-                return plan
-            else:
-                return {"plan": []}
-        except json.JSONDecodeError:
-            logger.warning("Could not parse LLM plan output.")
+            completion = await self._create_completion(
+                messages,
+                temperature=0.1,
+                max_tokens=1024,
+                tools=self.plan_tool_schemas,
+                tool_choice="auto",
+            )
+        except Exception as e:
+            logger.error(f"Groq API error: {e}")
             return {"plan": []}
 
-    def summarize_results(self, user_query: str, plan: list, results: list) -> dict:
+        plan = []
+        for call in completion.choices[0].message.tool_calls or []:
+            try:
+                args = json.loads(call.function.arguments or "{}")
+            except json.JSONDecodeError:
+                logger.warning(f"Could not parse arguments for tool call {call.function.name}.")
+                continue
+            plan.append({"tool": call.function.name, "arguments": args if isinstance(args, dict) else {}})
+        return {"plan": plan}
+
+    async def summarize_results(self, user_query: str, plan: list, results: list) -> dict:
         """Use LLM to summarize results into human-friendly output."""
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT_SUMMARIZE},
@@ -191,26 +436,33 @@ class FlightOpsMCPClient:
             {"role": "assistant", "content": f"Plan:\n{json.dumps(plan, indent=2)}"},
             {"role": "assistant", "content": f"Results:\n{json.dumps(results, indent=2)}"},
         ]
-        summary = self._call_groq(messages, temperature=0.3)
+        summary = await self._call_groq(messages, temperature=0.3)
         return {"summary": summary}
 
     # ---------- Orchestration ----------
 
-    async def run_query(self, user_query: str) -> dict:
+    async def run_query(self, user_query: str, defer_summary: bool = False) -> dict:
         """
         Full flow:
         1. Use LLM to plan tool calls.
-        2. Execute tools sequentially on MCP server.
+        2. Execute tools concurrently on MCP server.
         3. Summarize results via LLM.
+
+        With defer_summary=True the summary is started as a task and returned
+        under "summary_task", so callers can render results while it runs.
         """
         logger.info(f"User query: {user_query}")
-        plan_data = self.plan_tools(user_query)
-        plan = plan_data.get("plan", [])
+        plan = self._fast_plan(user_query)
+        if plan is not None:
+            logger.info("Planned query via fast path, skipping LLM planner")
+        else:
+            plan_data = await self.plan_tools(user_query)
+            plan = plan_data.get("plan", [])
 
         if not plan:
             return {"error": "LLM did not produce a valid tool plan."}
 
-        results = []
+        steps = []
         for step in plan:
             tool = step.get("tool")
             args = step.get("arguments", {})
@@ -224,10 +476,31 @@ class FlightOpsMCPClient:
             if not tool:
                 continue
 
-            logger.info(f"Invoking tool: {tool} with args: {args}")
-            resp = await self.invoke_tool(tool, args)
-            results.append({tool: resp})
+            logger.debug(f"Planned step: {tool} with args: {args}")
+            steps.append((tool, args))
+
+        # Plan steps are independent reads, so run them concurrently (order preserved)
+        calls = self._group_flight_steps(steps)
+        raw = await asyncio.gather(
+            *(self._invoke_bounded(tool, args) for tool, args, _ in calls),
+            return_exceptions=True,
+        )
+
+        results = [None] * len(steps)
+        for (call_tool, _, members), resp in zip(calls, raw):
+            if isinstance(resp, BaseException):
+                logger.error(f"Tool {call_tool} failed: {resp}")
+                resp = {"error": str(resp)}
+            for idx in members:
+                tool = steps[idx][0]
+                if call_tool == BUNDLE_TOOL:
+                    results[idx] = {tool: self._split_bundle(resp, tool)}
+                else:
+                    results[idx] = {tool: resp}
 
         # Summarize results
-        summary = self.summarize_results(user_query, plan, results)
+        summary_task = asyncio.create_task(self.summarize_results(user_query, plan, results))
+        if defer_summary:
+            return {"plan": plan, "results": results, "summary_task": summary_task}
+        summary = await summary_task
         return {"plan": plan, "results": results, "summary": summary}
\ No newline at end of file
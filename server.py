@@ -1,10 +1,19 @@
 # server.py
 import os
+import re
 import logging
 import json
-from typing import Optional, Any, Dict
-from datetime import datetime
+import functools
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Any, Dict, List
+from datetime import date, datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 from dotenv import load_dotenv
 load_dotenv() 
 
@@ -18,37 +27,136 @@ MONGODB_URL = os.getenv("MONGO_URI")
 DATABASE_NAME = os.getenv("MONGO_DB")
 COLLECTION_NAME = os.getenv("MONGO_COLLECTION")
 
+# Connection pool sizing; zlib is the fallback when zstandard isn't installed
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger("flightops.mcp.server")
 
+# Pretty-print responses only when debugging; compact output halves payload size
+PRETTY_JSON = os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG"
+
 mcp = FastMCP("FlightOps MCP Server")
 
 _mongo_client: Optional[AsyncIOMotorClient] = None
 _db = None
 _col = None
 
+# Compound index backing the (carrier, flightNumber, dateOfOrigin) lookups
+FLIGHT_INDEX_NAME = "cfd_idx"
+FLIGHT_INDEX_KEYS = [
+    ("flightLegState.carrier", 1),
+    ("flightLegState.flightNumber", 1),
+    ("flightLegState.dateOfOrigin", 1),
+]
+_index_ready = False
+# Earliest monotonic time at which a failed index setup may be retried
+INDEX_RETRY_SECONDS = 60
+_index_retry_at = 0.0
+_mongo_warm_attempted = False
+
+# Past-dated flight documents are immutable, so cache them: key -> (timestamp, doc)
+DOC_CACHE_TTL = int(os.getenv("MONGO_DOC_CACHE_TTL", "600"))
+DOC_CACHE_MAX = int(os.getenv("MONGO_DOC_CACHE_MAX", "1024"))
+_doc_cache: Dict[str, tuple] = {}
+
 async def get_mongodb_client():
     """Initialize and return the global Motor client, DB and collection."""
     global _mongo_client, _db, _col
     if _mongo_client is None:
         logger.info("Connecting to MongoDB: %s", MONGODB_URL)
-        _mongo_client = AsyncIOMotorClient(MONGODB_URL)
+        _mongo_client = AsyncIOMotorClient(
+            MONGODB_URL,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=3000,
+            compressors=MONGO_COMPRESSORS,
+        )
         _db = _mongo_client[DATABASE_NAME]
         _col = _db[COLLECTION_NAME]
+    await _ensure_index(_col)
     return _mongo_client, _db, _col
 
+async def _ensure_index(col):
+    """Create the flight index if it isn't known to exist, retrying failures lazily."""
+    global _index_ready, _index_retry_at
+    if _index_ready or time.monotonic() < _index_retry_at:
+        return
+    try:
+        await col.create_index(FLIGHT_INDEX_KEYS, name=FLIGHT_INDEX_NAME)
+        _index_ready = True
+    except Exception as exc:
+        _index_retry_at = time.monotonic() + INDEX_RETRY_SECONDS
+        logger.warning("Could not ensure index %s (%s); queries will run without a hint", FLIGHT_INDEX_NAME, exc)
+
+async def warm_mongodb():
+    """
+    Connect, ensure the index and run a cheap query so the pool is ready.
+    Runs at most once per process; a failure is logged and left to the lazy path.
+    """
+    global _mongo_warm_attempted
+    if _mongo_warm_attempted:
+        return
+    _mongo_warm_attempted = True
+    try:
+        _, _, col = await get_mongodb_client()
+        await col.find_one({}, {"_id": 1})
+        logger.info("MongoDB connection pool warmed")
+    except Exception as exc:
+        logger.warning("MongoDB warm-up failed (%s); connecting lazily on first tool call", exc)
+
+def create_app():
+    """
+    Build the streamable-http ASGI app with MongoDB warm-up in its lifespan.
+    FastMCP's own lifespan runs per MCP session, so process startup is hooked here.
+    """
+    app = mcp.streamable_http_app()
+    mcp_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app_):
+        async with mcp_lifespan(app_) as state:
+            await warm_mongodb()
+            yield state
+
+    app.router.lifespan_context = lifespan
+    return app
+
 def normalize_flight_number(flight_number: Any) -> Optional[int]:
     """Convert flight_number to int. MongoDB stores it as int."""
     if flight_number is None or flight_number == "":
         return None
     if isinstance(flight_number, int):
         return flight_number
+    # Stringify first so the cached parser always gets a hashable key
+    return _parse_flight_number(str(flight_number))
+
+@functools.lru_cache(maxsize=2048)
+def _parse_flight_number(flight_number: str) -> Optional[int]:
+    """Parse a flight number string; memoized since sessions reuse a few flights."""
     try:
-        return int(str(flight_number).strip())
-    except (ValueError, TypeError):
-        logger.warning(f"Could not normalize flight_number: {flight_number}")
+        return int(flight_number.strip())
+    except ValueError:
+        logger.warning("Could not normalize flight_number: %s", flight_number)
         return None
 
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Fallback formats, tried only when the ISO fast path misses
+_DATE_FORMATS = (
+    "%Y-%m-%d",      # 2024-6-23 (unpadded)
+    "%d-%m-%Y",      # 23-06-2024
+    "%Y/%m/%d",      # 2024/06/23
+    "%d/%m/%Y",      # 23/06/2024
+    "%B %d, %Y",     # June 23, 2024
+    "%d %B %Y",      # 23 June 2024
+    "%b %d, %Y",     # Jun 23, 2024
+    "%d %b %Y"       # 23 Jun 2024
+)
+
+@functools.lru_cache(maxsize=2048)
 def validate_date(date_str: str) -> Optional[str]:
     """
     Validate date_of_origin string. Accepts common formats.
@@ -57,26 +165,21 @@ def validate_date(date_str: str) -> Optional[str]:
     if not date_str or date_str == "":
         return None
     
-    # Handle common date formats
-    formats = [
-        "%Y-%m-%d",      # 2024-06-23
-        "%d-%m-%Y",      # 23-06-2024
-        "%Y/%m/%d",      # 2024/06/23
-        "%d/%m/%Y",      # 23/06/2024
-        "%B %d, %Y",     # June 23, 2024
-        "%d %B %Y",      # 23 June 2024
-        "%b %d, %Y",     # Jun 23, 2024
-        "%d %b %Y"       # 23 Jun 2024
-    ]
+    # Fast path: the planner is told to emit YYYY-MM-DD
+    if _ISO_DATE_RE.match(date_str):
+        try:
+            return date.fromisoformat(date_str).isoformat()
+        except ValueError:
+            pass
     
-    for fmt in formats:
+    for fmt in _DATE_FORMATS:
         try:
             dt = datetime.strptime(date_str, fmt)
             return dt.strftime("%Y-%m-%d")
         except ValueError:
             continue
     
-    logger.warning(f"Could not parse date: {date_str}")
+    logger.warning("Could not parse date: %s", date_str)
     return None
 
 def make_query(carrier: str, flight_number: Optional[int], date_of_origin: str) -> Dict:
@@ -97,16 +200,77 @@ def make_query(carrier: str, flight_number: Optional[int], date_of_origin: str)
     if date_of_origin:
         query["flightLegState.dateOfOrigin"] = date_of_origin
     
-    logger.info(f"Built query: {json.dumps(query)}")
+    logger.info("Built query: %r", query)
     return query
 
+def _doc_cache_key(query: dict, projection: dict) -> Optional[str]:
+    """
+    Return a cache key for queries on settled past flights, else None.
+    Yesterday's legs (overnight flights, late delay/fuel entries) may still change.
+    """
+    dob = query.get("flightLegState.dateOfOrigin")
+    if not dob or dob >= (date.today() - timedelta(days=1)).isoformat():
+        return None
+    return json.dumps([query, projection], sort_keys=True)
+
+def _dumps(payload: dict) -> str:
+    """Serialize a response payload, using orjson when available."""
+    if orjson is not None:
+        # Route datetimes through default=str so both branches emit "2024-06-23 10:00:00"
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+        return orjson.dumps(payload, option=option, default=str).decode()
+    return json.dumps(payload, indent=2 if PRETTY_JSON else None, default=str)
+
 def response_ok(data: Any) -> str:
     """Return JSON string for successful response."""
-    return json.dumps({"ok": True, "data": data}, indent=2, default=str)
+    return _dumps({"ok": True, "data": data})
 
 def response_error(msg: str, code: int = 400) -> str:
     """Return JSON string for error response."""
-    return json.dumps({"ok": False, "error": {"message": msg, "code": code}}, indent=2)
+    return _dumps({"ok": False, "error": {"message": msg, "code": code}})
+
+async def _find_one_doc(query: dict, projection: dict) -> Optional[dict]:
+    """
+    Fetch a single cleaned document, served from the document cache when possible.
+    Returns None if nothing matches; DB errors propagate to the caller.
+    """
+    global _index_ready
+    cache_key = _doc_cache_key(query, projection)
+    if cache_key:
+        cached = _doc_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < DOC_CACHE_TTL:
+            logger.info("Serving query from document cache")
+            return cached[1]
+
+    _, _, col = await get_mongodb_client()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Executing query: %s", json.dumps(query))
+    
+    # Hint only when the leading index key is filtered on
+    kwargs = {}
+    if _index_ready and "flightLegState.carrier" in query:
+        kwargs["hint"] = FLIGHT_INDEX_NAME
+    # Drop _id server-side; _class never matches an inclusion projection.
+    projection = {**projection, "_id": 0}
+    try:
+        result = await col.find_one(query, projection, **kwargs)
+    except OperationFailure as exc:
+        if "hint" not in kwargs or "hint" not in str(exc).lower():
+            raise
+        # Index was dropped behind our back: stop hinting and let _ensure_index recreate it
+        logger.warning("Index hint %s rejected (%s); retrying without hint", FLIGHT_INDEX_NAME, exc)
+        _index_ready = False
+        result = await col.find_one(query, projection)
+    
+    if not result:
+        logger.warning("No document found for query: %r", query)
+        return None
+    
+    if cache_key:
+        if len(_doc_cache) >= DOC_CACHE_MAX:
+            _doc_cache.pop(next(iter(_doc_cache)))
+        _doc_cache[cache_key] = (time.monotonic(), result)
+    return result
 
 async def _fetch_one_async(query: dict, projection: dict) -> str:          #  Point of concern
     """
@@ -114,27 +278,47 @@ async def _fetch_one_async(query: dict, projection: dict) -> str:          #  Po
     Returns JSON string response.
     """
     try:
-        _, _, col = await get_mongodb_client()
-        logger.info(f"Executing query: {json.dumps(query)}")
-        
-        result = await col.find_one(query, projection)
-        
+        result = await _find_one_doc(query, projection)
         if not result:
-            logger.warning(f"No document found for query: {json.dumps(query)}")
             return response_error("No matching document found.", code=404)
         
-        # Remove _id and _class to keep output clean
-        if "_id" in result:
-            result.pop("_id")
-        if "_class" in result:
-            result.pop("_class")
-        
-        logger.info(f"Query successful")
+        logger.info("Query successful")
         return response_ok(result)
     except Exception as exc:
         logger.exception("DB query failed")
         return response_error(f"DB query failed: {str(exc)}", code=500)
 
+def _union_projection(tool_names: List[str]) -> Dict[str, int]:
+    """
+    Union the projections of several tools, dropping paths already covered by
+    a parent path (MongoDB rejects overlapping projection paths).
+    """
+    paths = sorted({path for name in tool_names for path in PROJECTIONS[name]})
+    union: Dict[str, int] = {}
+    for path in paths:
+        if not any(path.startswith(kept + ".") for kept in union):
+            union[path] = 1
+    return union
+
+def _slice_doc(doc: Any, paths: List[List[str]]) -> Any:
+    """Apply projection paths (split on '.') to an already fetched document."""
+    if isinstance(doc, list):
+        return [_slice_doc(item, paths) for item in doc if isinstance(item, (dict, list))]
+    
+    by_head: Dict[str, List[List[str]]] = {}
+    for parts in paths:
+        by_head.setdefault(parts[0], []).append(parts[1:])
+    
+    sliced = {}
+    for head, rests in by_head.items():
+        if head not in doc:
+            continue
+        if any(not rest for rest in rests):
+            sliced[head] = doc[head]
+        elif isinstance(doc[head], (dict, list)):
+            sliced[head] = _slice_doc(doc[head], rests)
+    return sliced
+
 # --- MCP Tools ---
 
 @mcp.tool()
@@ -151,29 +335,10 @@ async def health_check() -> str:
         logger.exception("Health check DB ping failed")
         return response_error("DB unreachable", code=503)
 
-@mcp.tool()
-async def get_flight_basic_info(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Fetch basic flight information including carrier, flight number, date, stations, times, and status.
-    
-    Args:
-        carrier: Airline carrier code (e.g., "6E", "AI")
-        flight_number: Flight number as string (e.g., "215")
-        date_of_origin: Date in YYYY-MM-DD format (e.g., "2024-06-23")
-    """
-    logger.info(f"get_flight_basic_info: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    # Normalize inputs
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    if date_of_origin and not dob:
-        return response_error("Invalid date_of_origin format. Expected YYYY-MM-DD or common date formats", 400)
-    
-    query = make_query(carrier, fn, dob)
-    
-    # Project basic flight information
-    projection = {
+# Per-tool projections for the single-flight lookup tools. Every tool shares the
+# same (carrier, flight_number, date_of_origin) query; only the fields differ.
+PROJECTIONS: Dict[str, Dict[str, int]] = {
+    "get_flight_basic_info": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.suffix": 1,
@@ -191,32 +356,8 @@ async def get_flight_basic_info(carrier: str = "", flight_number: str = "", date
         "flightLegState.blockTimeSch": 1,
         "flightLegState.blockTimeActual": 1,
         "flightLegState.flightHoursActual": 1
-    }
-    
-    return await _fetch_one_async(query, projection)
-
-@mcp.tool()
-async def get_operation_times(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Return estimated and actual operation times for a flight including takeoff, landing, block times.
-    
-    Args:
-        carrier: Airline carrier code
-        flight_number: Flight number as string
-        date_of_origin: Date in YYYY-MM-DD format
-    """
-    logger.info(f"get_operation_times: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    if date_of_origin and not dob:
-        return response_error("Invalid date format.", 400)
-    
-    query = make_query(carrier, fn, dob)
-    
-    projection = {
-       
+    },
+    "get_operation_times": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.dateOfOrigin": 1,
@@ -231,29 +372,8 @@ async def get_operation_times(carrier: str = "", flight_number: str = "", date_o
         "flightLegState.blockTimeSch": 1,
         "flightLegState.blockTimeActual": 1,
         "flightLegState.flightHoursActual": 1
-    }
-    
-    return await _fetch_one_async(query, projection)
-
-@mcp.tool()
-async def get_equipment_info(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Get aircraft equipment details including aircraft type, registration (tail number), and configuration.
-    
-    Args:
-        carrier: Airline carrier code
-        flight_number: Flight number as string
-        date_of_origin: Date in YYYY-MM-DD format
-    """
-    logger.info(f"get_equipment_info: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    query = make_query(carrier, fn, dob)
-    
-    projection = {
-        
+    },
+    "get_equipment_info": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.dateOfOrigin": 1,
@@ -268,29 +388,8 @@ async def get_equipment_info(carrier: str = "", flight_number: str = "", date_of
         "flightLegState.equipment.tailLock": 1,
         "flightLegState.equipment.onwardFlight": 1,
         "flightLegState.equipment.actualOnwardFlight": 1
-    }
-    
-    return await _fetch_one_async(query, projection)
-
-@mcp.tool()
-async def get_delay_summary(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Summarize delay reasons, durations, and total delay time for a specific flight.
-    
-    Args:
-        carrier: Airline carrier code
-        flight_number: Flight number as string
-        date_of_origin: Date in YYYY-MM-DD format
-    """
-    logger.info(f"get_delay_summary: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    query = make_query(carrier, fn, dob)
-    
-    projection = {
-   
+    },
+    "get_delay_summary": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.dateOfOrigin": 1,
@@ -299,29 +398,8 @@ async def get_delay_summary(carrier: str = "", flight_number: str = "", date_of_
         "flightLegState.scheduledStartTime": 1,
         "flightLegState.operation.actualTimes.offBlock": 1,
         "flightLegState.delays": 1
-    }
-    
-    return await _fetch_one_async(query, projection)
-
-@mcp.tool()
-async def get_fuel_summary(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Retrieve fuel summary including planned vs actual fuel for takeoff, landing, and total consumption.
-    
-    Args:
-        carrier: Airline carrier code
-        flight_number: Flight number as string
-        date_of_origin: Date in YYYY-MM-DD format
-    """
-    logger.info(f"get_fuel_summary: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    query = make_query(carrier, fn, dob)
-    
-    projection = {
-       
+    },
+    "get_fuel_summary": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.dateOfOrigin": 1,
@@ -332,63 +410,107 @@ async def get_fuel_summary(carrier: str = "", flight_number: str = "", date_of_o
         "flightLegState.operation.flightPlan.takeoffFuel": 1,
         "flightLegState.operation.flightPlan.landingFuel": 1,
         "flightLegState.operation.flightPlan.holdFuel": 1
-    }
-    
-    return await _fetch_one_async(query, projection)
-
-@mcp.tool()
-async def get_passenger_info(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
-    """
-    Get passenger count and connection information for the flight.
-    
-    Args:
-        carrier: Airline carrier code
-        flight_number: Flight number as string
-        date_of_origin: Date in YYYY-MM-DD format
-    """
-    logger.info(f"get_passenger_info: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
-    
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
-    
-    query = make_query(carrier, fn, dob)
-    
-    projection = {
-        
+    },
+    "get_passenger_info": {
         "flightLegState.carrier": 1,
         "flightLegState.flightNumber": 1,
         "flightLegState.dateOfOrigin": 1,
         "flightLegState.pax": 1
+    },
+    "get_crew_info": {
+        "flightLegState.carrier": 1,
+        "flightLegState.flightNumber": 1,
+        "flightLegState.dateOfOrigin": 1,
+        "flightLegState.crewConnections": 1
     }
+}
+
+TOOL_DESCRIPTIONS: Dict[str, str] = {
+    "get_flight_basic_info": "Fetch basic flight information including carrier, flight number, date, stations, times, and status.",
+    "get_operation_times": "Return estimated and actual operation times for a flight including takeoff, landing, block times.",
+    "get_equipment_info": "Get aircraft equipment details including aircraft type, registration (tail number), and configuration.",
+    "get_delay_summary": "Summarize delay reasons, durations, and total delay time for a specific flight.",
+    "get_fuel_summary": "Retrieve fuel summary including planned vs actual fuel for takeoff, landing, and total consumption.",
+    "get_passenger_info": "Get passenger count and connection information for the flight.",
+    "get_crew_info": "Get crew connections and details for the flight."
+}
+
+_FLIGHT_TOOL_ARGS_DOC = """
+
+Args:
+    carrier: Airline carrier code (e.g., "6E", "AI")
+    flight_number: Flight number as string (e.g., "215")
+    date_of_origin: Date in YYYY-MM-DD format (e.g., "2024-06-23")
+"""
+
+INVALID_DATE_MESSAGE = "Invalid date_of_origin format. Expected YYYY-MM-DD or common date formats"
+
+def _flight_query(carrier: str, flight_number: str, date_of_origin: str) -> Optional[Dict]:
+    """Normalize tool inputs into a MongoDB query; None if the date is invalid."""
+    fn = normalize_flight_number(flight_number) if flight_number else None
+    dob = validate_date(date_of_origin) if date_of_origin else None
+    
+    if date_of_origin and not dob:
+        return None
+    return make_query(carrier, fn, dob)
+
+async def _handle_flight_tool(name: str, projection: dict, carrier: str, flight_number: str, date_of_origin: str) -> str:
+    """Shared normalize/validate/query pipeline for the single-flight tools."""
+    logger.info("%s: carrier=%s, flight_number=%s, date=%s", name, carrier, flight_number, date_of_origin)
     
+    query = _flight_query(carrier, flight_number, date_of_origin)
+    if query is None:
+        return response_error(INVALID_DATE_MESSAGE, 400)
     return await _fetch_one_async(query, projection)
 
+def _make_flight_tool(name: str, projection: dict):
+    """Register a single-flight MCP tool backed by the given projection."""
+    async def _tool(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
+        return await _handle_flight_tool(name, projection, carrier, flight_number, date_of_origin)
+    
+    _tool.__name__ = name
+    _tool.__doc__ = TOOL_DESCRIPTIONS[name] + _FLIGHT_TOOL_ARGS_DOC
+    mcp.tool(name=name, description=_tool.__doc__.strip())(_tool)
+    return _tool
+
+for _name, _projection in PROJECTIONS.items():
+    _make_flight_tool(_name, _projection)
+
 @mcp.tool()
-async def get_crew_info(carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
+async def get_flight_bundle(tools: List[str], carrier: str = "", flight_number: str = "", date_of_origin: str = "") -> str:
     """
-    Get crew connections and details for the flight.
+    Run several single-flight lookup tools for the same flight with one DB query.
+    Returns a mapping of tool name to the data that tool would have returned.
     
     Args:
+        tools: Names of the lookup tools to run (e.g., ["get_flight_basic_info", "get_delay_summary"])
         carrier: Airline carrier code
         flight_number: Flight number as string
         date_of_origin: Date in YYYY-MM-DD format
     """
-    logger.info(f"get_crew_info: carrier={carrier}, flight_number={flight_number}, date={date_of_origin}")
+    logger.info("get_flight_bundle: tools=%s, carrier=%s, flight_number=%s, date=%s", tools, carrier, flight_number, date_of_origin)
     
-    fn = normalize_flight_number(flight_number) if flight_number else None
-    dob = validate_date(date_of_origin) if date_of_origin else None
+    unknown = [name for name in tools if name not in PROJECTIONS]
+    if not tools or unknown:
+        return response_error(f"Unknown or missing bundle tools: {unknown}. Valid tools: {list(PROJECTIONS)}", 400)
     
-    query = make_query(carrier, fn, dob)
+    query = _flight_query(carrier, flight_number, date_of_origin)
+    if query is None:
+        return response_error(INVALID_DATE_MESSAGE, 400)
     
-    projection = {
-        
-        "flightLegState.carrier": 1,
-        "flightLegState.flightNumber": 1,
-        "flightLegState.dateOfOrigin": 1,
-        "flightLegState.crewConnections": 1
-    }
+    try:
+        result = await _find_one_doc(query, _union_projection(tools))
+    except Exception as exc:
+        logger.exception("DB query failed")
+        return response_error(f"DB query failed: {str(exc)}", code=500)
     
-    return await _fetch_one_async(query, projection)
+    if not result:
+        return response_error("No matching document found.", code=404)
+    
+    return response_ok({
+        name: _slice_doc(result, [path.split(".") for path in PROJECTIONS[name]])
+        for name in tools
+    })
 
 @mcp.tool()
 async def raw_mongodb_query(query_json: str, limit: int = 10) -> str:
@@ -408,15 +530,14 @@ async def raw_mongodb_query(query_json: str, limit: int = 10) -> str:
             return response_error(f"Invalid JSON query: {str(e)}. Example: '{{\"flightLegState.carrier\": \"6E\"}}'", 400)
         
         limit = min(max(1, int(limit)), 50)
-        cursor = col.find(query).sort("flightLegState.dateOfOrigin", -1).limit(limit)
-        docs = []
-        
-        async for doc in cursor:
-            if "_id" in doc:
-                doc.pop("_id")
-            if "_class" in doc:
-                doc.pop("_class")
-            docs.append(doc)
+        # Strip _id/_class server-side and fetch everything in one batch
+        cursor = (
+            col.find(query, projection={"_id": 0, "_class": 0})
+            .sort("flightLegState.dateOfOrigin", -1)
+            .limit(limit)
+            .batch_size(limit)
+        )
+        docs = await cursor.to_list(length=limit)
         
         if not docs:
             return response_error("No documents found for given query.", 404)
@@ -430,4 +551,6 @@ async def raw_mongodb_query(query_json: str, limit: int = 10) -> str:
 if __name__ == "__main__":
     logger.info("Starting FlightOps MCP Server on %s:%s (transport=%s)", HOST, PORT, TRANSPORT)
     logger.info("MongoDB URL: %s, Database: %s, Collection: %s", MONGODB_URL, DATABASE_NAME, COLLECTION_NAME)
-    mcp.run(transport="streamable-http")
\ No newline at end of file
+    import uvicorn
+    # loop="auto" picks uvloop when it is installed (Linux/macOS), else asyncio
+    uvicorn.run(create_app(), host=HOST, port=PORT, loop="auto", log_level=os.getenv("LOG_LEVEL", "INFO").lower())
\ No newline at end of file
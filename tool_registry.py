@@ -1,32 +1,44 @@
 # tool_registry.py
 
+# JSON schema for each tool argument, used to build LLM function-calling schemas
+ARG_SCHEMAS = {
+    "carrier": {"type": "string", "description": "airline code, e.g. 6E"},
+    "flight_number": {"type": "string", "description": "e.g. 215"},
+    "date_of_origin": {"type": "string", "description": "YYYY-MM-DD"},
+    "query_json": {"type": "string", "description": "MongoDB filter as JSON"},
+    "limit": {"type": "integer", "description": "max documents, <= 50"},
+}
+
+# Arguments that must always be supplied
+REQUIRED_ARGS = {"query_json"}
+
 TOOLS = {
     "get_flight_basic_info": {
         "args": ["carrier", "flight_number", "date_of_origin"],
-        "desc": "Fetch basic flight information including carrier, flight number, stations, scheduled times, and flight status.",
+        "desc": "basic flight info: stations, schedule, status",
     },
     "get_equipment_info": {
         "args": ["carrier", "flight_number", "date_of_origin"],
-        "desc": "Get aircraft equipment details: aircraft type, tail number (registration), and configuration.",
+        "desc": "aircraft type, tail number, configuration",
     },
     "get_operation_times": {
         "args": ["carrier", "flight_number", "date_of_origin"],
-        "desc": "Return estimated and actual operation times: takeoff, landing, departure, arrival, and block times.",
+        "desc": "estimated/actual takeoff, landing, block times",
     },
     "get_fuel_summary": {
         "args": ["carrier", "flight_number", "date_of_origin"],
-        "desc": "Retrieve fuel summary including planned vs actual fuel consumption for the flight.",
+        "desc": "planned vs actual fuel consumption",
     },
     "get_delay_summary": {
         "args": ["carrier", "flight_number", "date_of_origin"],
-        "desc": "Get delay information including delay reasons, durations, and total delay time.",
+        "desc": "delay reasons, durations, total delay",
     },
     "health_check": {
         "args": [],
-        "desc": "Check the health status of the MCP server and database connection.",
+        "desc": "server and database health",
     },
     "raw_mongodb_query": {
         "args": ["query_json", "limit"],
-        "desc": "Run a raw MongoDB query (JSON format) for debugging purposes.",
+        "desc": "raw MongoDB JSON query, debugging only",
     },
 }
\ No newline at end of file